@@ -3,30 +3,114 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import pandas as pd
 import time
-import requests
-from urllib.parse import urljoin
+import csv
+import json
+import gzip
+import hashlib
+import tempfile
+import asyncio
+import aiohttp
+from aiolimiter import AsyncLimiter
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import os
+import queue
 
 # Configuration
 BASE_URL = "https://re25.mapyourshow.com/8_0/explore/exhibitor-gallery.cfm"
 MAX_THREADS = 5
 TOTAL_PAGES = 53  # 1325 exhibitors ÷ 25 per page
+MIN_LINKS_PER_PAGE = 20  # Listing counts as rendered once this many exhibitor links exist
+# JSON endpoint behind the gallery's XHR (reported by iter_exhibitor_links on a browser run).
+# Leave as None to render the gallery pages with Selenium.
+LIST_API = None
+DETAIL_URL = "https://re25.mapyourshow.com/8_0/exhibitor/exhibitor-details.cfm?exhid={exhid}"
+EXHIBITOR_ID_KEYS = ('exhid', 'exhid_l', 'exhibitorId', 'exhibitorid')
+LIST_API_HINTS = ('exhibitor', 'gallery')  # Path fragments of a JSON request worth reporting
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+JS_RENDERED_DETAILS = False  # Set to True if detail pages need a browser to render
+CONCURRENCY = 50  # Detail page requests in flight at once
+LINK_QUEUE_SIZE = 200  # Listed links waiting for a detail worker
+REQUESTS_PER_SECOND = 10  # Politeness budget shared by every request to the site
+CACHE_DIR = "re25_cache"  # Detail page bodies, so re-runs skip the network
+CACHE_MAX_AGE = 24 * 60 * 60  # Seconds before a cached page is fetched again
+PROGRESS_FLUSH_ROWS = 50
+PROGRESS_FLUSH_SECONDS = 5
+PROGRESS_FILE = "re25_exhibitors_progress.csv"
+COLUMNS = ['Exhibitor Name', 'Website URL', 'Booth Location', 'Contact Info', 'Detail Page URL']
 
-def setup_driver():
+def has_class(name):
+    """XPath predicate matching a whole class token, like the CSS .name selector"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+# Detail page XPaths in fallback order, compiled once and evaluated by libxml2
+NAME_XPS = [etree.XPath(p) for p in ('//h1', f'//*[{has_class("exhibitor-title")}]', '//*[@itemprop="name"]')]
+BOOTH_XPS = [etree.XPath(p) for p in (f'//*[{has_class("booth-number")}]', f'//*[{has_class("booth-location")}]',
+                                      '//*[contains(@class, "booth")]')]
+WEBSITE_XPS = [etree.XPath(p) for p in ('//a[contains(@href, "http")]/@href', f'//*[{has_class("website-link")}]/@href',
+                                        '//*[@itemprop="url"]/@href', '//a[@target="_blank"]/@href')]
+# Contact blocks are collected in a single document-order walk rather than one query per selector
+CONTACT_XP = etree.XPath(f'//*[contains(@class, "contact") or {has_class("address")} or {has_class("email")}]')
+
+# Token bucket shared by all workers: full speed up to the budget, never bursting past it
+RATE_LIMITER = AsyncLimiter(REQUESTS_PER_SECOND, 1)
+
+# Per-thread WebDrivers for JS_RENDERED_DETAILS, tracked so they can be shut down
+_thread_local = threading.local()
+_thread_drivers = []
+_thread_drivers_lock = threading.Lock()
+
+def setup_driver(log_network=False):
     """Configure Chrome WebDriver with optimal settings"""
     options = webdriver.ChromeOptions()
+    if log_network:
+        # Record network events so find_list_api() can spot the gallery's JSON requests
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
     options.add_argument('--headless')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-background-networking')
+    options.add_argument('--disable-sync')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    # Only the DOM is scraped, so skip images, stylesheets and fonts
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
+        'profile.default_content_setting_values.fonts': 2
+    })
+    # Return from driver.get() once the DOM is parsed instead of waiting for every resource
+    options.page_load_strategy = 'eager'
     driver = webdriver.Chrome(options=options)
     driver.set_page_load_timeout(30)
     return driver
 
+def get_thread_driver():
+    """Return the calling worker thread's WebDriver, creating it on first use"""
+    driver = getattr(_thread_local, 'driver', None)
+    if driver is None:
+        driver = setup_driver()
+        _thread_local.driver = driver
+        with _thread_drivers_lock:
+            _thread_drivers.append(driver)
+    return driver
+
+def quit_thread_drivers():
+    """Shut down every WebDriver created by the worker threads"""
+    with _thread_drivers_lock:
+        for driver in _thread_drivers:
+            driver.quit()
+        _thread_drivers.clear()
+
 def get_exhibitor_links(driver, page_url):
-    """Extract exhibitor detail page links with improved selectors"""
+    """Extract exhibitor detail page links from the rendered gallery page"""
     print(f"Scraping page: {page_url}")
     try:
         driver.get(page_url)
@@ -35,28 +119,19 @@ def get_exhibitor_links(driver, page_url):
             EC.presence_of_element_located((By.CSS_SELECTOR, ".exhibitor-list, .exhibitor-item, [id*='exhibitor']"))
         )
         
-        # Additional wait for dynamic content
-        time.sleep(2)
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        links = []
+        # Wait until the listing has rendered, but read whatever loaded on short pages
+        try:
+            WebDriverWait(driver, 15).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, 'a[href*="exhibitor-details"]')) >= MIN_LINKS_PER_PAGE
+            )
+        except TimeoutException:
+            pass
         
-        # Multiple selector strategies to find exhibitor links
-        selectors = [
-            'a[href*="exhibitor-details"]',
-            '.exhibitor-name a',
-            '.exhibitor-link',
-            '[data-exhibitor-id] a'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                href = element.get('href')
-                if href and 'exhibitor-details' in href:
-                    full_url = urljoin(page_url, href)
-                    if full_url not in links:
-                        links.append(full_url)
+        # Read the resolved hrefs in the browser with one script call instead of serializing the DOM
+        hrefs = driver.execute_script(
+            "return Array.from(document.querySelectorAll('a[href*=\"exhibitor-details\"]'), a => a.href)"
+        )
+        links = list(dict.fromkeys(hrefs))
         
         print(f"Found {len(links)} exhibitor links on this page")
         return links
@@ -65,26 +140,168 @@ def get_exhibitor_links(driver, page_url):
         print(f"Error scraping page {page_url}: {str(e)}")
         return []
 
-def scrape_exhibitor_detail(driver, detail_url):
-    """Scrape detailed information from individual exhibitor page"""
+def find_list_api(driver):
+    """Return the JSON endpoint the loaded gallery page fetched its exhibitors from, if any"""
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message['method'] != 'Network.responseReceived':
+            continue
+        params = message['params']
+        if params.get('type') not in ('XHR', 'Fetch') or 'json' not in params['response'].get('mimeType', ''):
+            continue
+        # Skip analytics and config calls; only exhibitor listing endpoints are candidates
+        url = params['response']['url']
+        if any(hint in urlparse(url).path.lower() for hint in LIST_API_HINTS):
+            return url
+    return None
+
+def find_exhibitor_ids(payload):
+    """Yield exhibitor IDs from a JSON payload without assuming its nesting"""
+    if isinstance(payload, dict):
+        for key, value in payload.items():
+            if key in EXHIBITOR_ID_KEYS:
+                yield from (value if isinstance(value, list) else [value])
+            else:
+                yield from find_exhibitor_ids(value)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from find_exhibitor_ids(item)
+
+async def get_exhibitor_links_api(session, page_num):
+    """Fetch one gallery page of exhibitor links from LIST_API"""
+    print(f"Fetching page {page_num} from {LIST_API}")
     try:
-        driver.get(detail_url)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, 'body'))
-        )
+        await RATE_LIMITER.acquire()
+        async with session.get(LIST_API, params={'page': page_num}) as response:
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        links = list(dict.fromkeys(DETAIL_URL.format(exhid=exhid) for exhid in find_exhibitor_ids(payload)))
+        print(f"Found {len(links)} exhibitor links on this page")
+        return links
         
-        # Extract data with multiple fallback strategies
-        data = {
-            'Exhibitor Name': extract_with_fallback(soup, ['h1', '.exhibitor-title', '[itemprop="name"]']),
-            'Website URL': extract_website(soup),
-            'Booth Location': extract_with_fallback(soup, ['.booth-number', '.booth-location', '[class*="booth"]']),
-            'Contact Info': extract_contact_info(soup),
-            'Detail Page URL': detail_url
-        }
+    except Exception as e:
+        print(f"Error fetching page {page_num} from {LIST_API}: {str(e)}")
+        return []
+
+async def iter_exhibitor_links():
+    """Yield each gallery page's exhibitor detail links as soon as that page is scraped"""
+    if LIST_API:
+        timeout = aiohttp.ClientTimeout(total=15)
+        async with aiohttp.ClientSession(headers={'User-Agent': USER_AGENT}, timeout=timeout) as session:
+            for page_num in range(1, TOTAL_PAGES + 1):
+                yield await get_exhibitor_links_api(session, page_num)
+        return
+    
+    # No known JSON endpoint, so render the gallery pages in the browser
+    driver = setup_driver(log_network=True)
+    try:
+        for page_num in range(1, TOTAL_PAGES + 1):
+            page_url = f"{BASE_URL}?featured=false&page={page_num}"
+            await RATE_LIMITER.acquire()
+            links = await asyncio.to_thread(get_exhibitor_links, driver, page_url)
+            
+            if page_num == 1:
+                api_url = await asyncio.to_thread(find_list_api, driver)
+                if api_url:
+                    print(f"Gallery loads exhibitors from {api_url} - set LIST_API to skip the browser")
+            else:
+                # Drain the performance log so it doesn't pile up across every page
+                await asyncio.to_thread(driver.get_log, 'performance')
+            yield links
+    finally:
+        driver.quit()
+
+async def iter_new_links(scraped_urls, all_exhibitor_links):
+    """Yield links not yet scraped as gallery pages come in, recording every link found"""
+    async for links in iter_exhibitor_links():
+        all_exhibitor_links.extend(links)
+        print(f"Total links collected: {len(all_exhibitor_links)}")
+        for url in links:
+            if url not in scraped_urls:
+                yield url
+
+def fetch_rendered_page(detail_url):
+    """Fetch detail page HTML through the calling worker thread's WebDriver"""
+    driver = get_thread_driver()
+    driver.get(detail_url)
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.TAG_NAME, 'body'))
+    )
+    return driver.page_source
+
+def cache_path(url):
+    """Location of the gzip-compressed cached body for a URL"""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html.gz')
+
+def read_cached_page(url):
+    """Return the cached body for a URL, or None if it is missing, unreadable or older than CACHE_MAX_AGE"""
+    path = cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_MAX_AGE:
+            return None
+        with open(path, 'rb') as f:
+            return gzip.decompress(f.read())
+    except (OSError, EOFError):
+        return None
+
+def write_cached_page(url, body):
+    """Store a page body in the cache, replacing the file atomically"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # A unique temp file per write, so overlapping writes for one URL never replace each other's file
+    tmp = tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix='.tmp', delete=False)
+    try:
+        with tmp:
+            tmp.write(gzip.compress(body))
+        os.replace(tmp.name, cache_path(url))
+    except BaseException:
+        os.remove(tmp.name)
+        raise
+
+async def fetch(session, url):
+    """Download a page body over HTTP, serving it from the disk cache when possible"""
+    # Cache reads and writes (gzip + disk) run in the default executor to keep the event loop free
+    loop = asyncio.get_running_loop()
+    body = await loop.run_in_executor(None, read_cached_page, url)
+    if body is not None:
+        return body
+    
+    await RATE_LIMITER.acquire()
+    async with session.get(url) as response:
+        response.raise_for_status()
+        body = await response.read()
+    try:
+        await loop.run_in_executor(None, write_cached_page, url, body)
+    except OSError as e:
+        # The page downloaded fine; a failed cache write only costs a refetch next run
+        print(f"Could not cache {url}: {e}")
+    return body
+
+def parse_exhibitor_detail(html, detail_url):
+    """Extract exhibitor fields from detail page HTML"""
+    tree = lxml.html.fromstring(html)
+    
+    # Extract data with multiple fallback strategies
+    return {
+        'Exhibitor Name': extract_with_fallback(tree, NAME_XPS),
+        'Website URL': extract_website(tree),
+        'Booth Location': extract_with_fallback(tree, BOOTH_XPS),
+        'Contact Info': extract_contact_info(tree),
+        'Detail Page URL': detail_url
+    }
+
+async def scrape_exhibitor_detail(session, executor, detail_url):
+    """Scrape detailed information from individual exhibitor page"""
+    loop = asyncio.get_running_loop()
+    try:
+        if JS_RENDERED_DETAILS:
+            await RATE_LIMITER.acquire()
+            html = await loop.run_in_executor(executor, fetch_rendered_page, detail_url)
+        else:
+            html = await fetch(session, detail_url)
         
-        return data
+        # Parse off the event loop so it overlaps with in-flight fetches
+        return await loop.run_in_executor(None, parse_exhibitor_detail, html, detail_url)
         
     except Exception as e:
         print(f"Error scraping {detail_url}: {str(e)}")
@@ -96,91 +313,156 @@ def scrape_exhibitor_detail(driver, detail_url):
             'Detail Page URL': detail_url
         }
 
-def extract_with_fallback(soup, selectors):
-    """Try multiple selectors for robust data extraction"""
-    for selector in selectors:
-        element = soup.select_one(selector)
-        if element and element.text.strip():
-            return element.text.strip()
+async def scrape_details(detail_urls):
+    """Scrape detail pages as their URLs arrive, yielding each result as it completes"""
+    # detail_urls may be a list or an async iterable that is still listing the gallery
+    link_q = asyncio.Queue(maxsize=LINK_QUEUE_SIZE)
+    result_q = asyncio.Queue()
+    
+    async def produce_links():
+        try:
+            if hasattr(detail_urls, '__aiter__'):
+                async for url in detail_urls:
+                    await link_q.put(url)
+            else:
+                for url in detail_urls:
+                    await link_q.put(url)
+        finally:
+            # Stop the consumers even if listing fails, so the links already queued are still scraped
+            for _ in range(CONCURRENCY):
+                await link_q.put(None)  # One stop sentinel per consumer
+    
+    async def consume_details(session, executor):
+        while True:
+            url = await link_q.get()
+            if url is None:
+                return
+            await result_q.put(await scrape_exhibitor_detail(session, executor, url))
+    
+    timeout = aiohttp.ClientTimeout(total=15)
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
+        async with aiohttp.ClientSession(headers={'User-Agent': USER_AGENT}, timeout=timeout,
+                                         connector=connector) as session:
+            producer = asyncio.ensure_future(produce_links())
+            workers = [asyncio.ensure_future(consume_details(session, executor)) for _ in range(CONCURRENCY)]
+            consumers = asyncio.gather(*workers)
+            # Results end once every consumer has stopped, not when listing stops
+            consumers.add_done_callback(lambda _: result_q.put_nowait(None))
+            
+            try:
+                while True:
+                    data = await result_q.get()
+                    if data is None:
+                        break
+                    yield data
+                await consumers
+                await producer  # Surface any listing error after in-flight details are saved
+            finally:
+                # Never leave workers running against a closing session if the caller stops early
+                for task in (producer, *workers):
+                    task.cancel()
+                await asyncio.gather(producer, consumers, return_exceptions=True)
+
+def get_scraped_urls(filename):
+    """Load the detail page URLs already saved to the progress file, skipping failed fetches"""
+    if os.path.exists(filename):
+        try:
+            df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+            # A row that is N/A in every field is a failed fetch, so leave it out to retry that page
+            failed = (df.drop(columns='Detail Page URL') == 'N/A').all(axis=1)
+            return set(df.loc[~failed, 'Detail Page URL'])
+        except Exception as e:
+            # Resuming with an empty set would re-scrape everything and append duplicates, so stop instead
+            print(f"Could not read progress file {filename}: {e}")
+            raise
+    return set()
+
+def writer_loop(writer_q, filename):
+    """Append rows from writer_q to a CSV file until a None sentinel arrives"""
+    with open(filename, 'a', newline='', encoding='utf-8') as progress_file:
+        writer = csv.DictWriter(progress_file, fieldnames=COLUMNS)
+        if progress_file.tell() == 0:
+            writer.writeheader()
+        
+        written = 0
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                row = writer_q.get(timeout=PROGRESS_FLUSH_SECONDS)
+            except queue.Empty:
+                pass  # Nothing new, but still honour the time-based flush
+            else:
+                if row is None:
+                    break
+                writer.writerow(row)
+                written += 1
+                pending += 1
+            
+            # Flush every PROGRESS_FLUSH_ROWS rows or PROGRESS_FLUSH_SECONDS seconds
+            if pending and (pending >= PROGRESS_FLUSH_ROWS or time.monotonic() - last_flush >= PROGRESS_FLUSH_SECONDS):
+                progress_file.flush()
+                print(f"Progress saved: {written} records written to {filename}")
+                pending = 0
+                last_flush = time.monotonic()
+
+def extract_with_fallback(tree, xpaths):
+    """Try multiple compiled XPaths for robust data extraction"""
+    for xpath in xpaths:
+        elements = xpath(tree)
+        if elements and elements[0].text_content().strip():
+            return elements[0].text_content().strip()
     return 'N/A'
 
-def extract_website(soup):
+def extract_website(tree):
     """Extract website URL with multiple strategies"""
-    website_selectors = [
-        'a[href*="http"]',
-        '.website-link',
-        '[itemprop="url"]',
-        'a[target="_blank"]'
-    ]
-    
-    for selector in website_selectors:
-        element = soup.select_one(selector)
-        if element and element.get('href'):
-            return element.get('href')
+    for xpath in WEBSITE_XPS:
+        hrefs = xpath(tree)
+        if hrefs and hrefs[0]:
+            return str(hrefs[0])
     return 'N/A'
 
-def extract_contact_info(soup):
+def extract_contact_info(tree):
     """Extract contact information with comprehensive approach"""
-    contact_text = ''
-    contact_selectors = [
-        '.contact-info',
-        '.contact-details',
-        '[class*="contact"]',
-        '.address',
-        '.email'
-    ]
-    
-    for selector in contact_selectors:
-        elements = soup.select(selector)
-        for element in elements:
-            if element.text.strip():
-                contact_text += element.text.strip() + ' | '
-    
-    return contact_text[:-3] if contact_text else 'N/A'
+    texts = (element.text_content().strip() for element in CONTACT_XP(tree))
+    return ' | '.join(text for text in texts if text) or 'N/A'
 
-def main():
+async def main_async():
     print("Starting RE+ 2025 exhibitor scraping...")
-    driver = setup_driver()
-    all_exhibitor_links = []
-    
-    # Build paginated URLs
-    page_urls = []
-    for page_num in range(1, TOTAL_PAGES + 1):
-        page_url = f"{BASE_URL}?featured=false&page={page_num}"
-        page_urls.append(page_url)
     
-    # Collect all exhibitor links
-    for page_url in page_urls:
-        links = get_exhibitor_links(driver, page_url)
-        all_exhibitor_links.extend(links)
-        print(f"Total links collected: {len(all_exhibitor_links)}")
-        time.sleep(1)  # Respectful delay between requests
+    # Skip exhibitors already saved by an earlier run
+    scraped_urls = get_scraped_urls(PROGRESS_FILE)
+    if scraped_urls:
+        print(f"Found {len(scraped_urls)} already scraped exhibitors")
     
-    print(f"Final count: {len(all_exhibitor_links)} exhibitor links found")
+    # Progress rows are appended by a background thread so disk I/O never blocks scraping
+    writer_q = queue.Queue()
+    writer_thread = threading.Thread(target=writer_loop, args=(writer_q, PROGRESS_FILE), daemon=True)
+    writer_thread.start()
     
-    # Scrape detail pages
-    exhibitors_data = []
-    for i, link in enumerate(all_exhibitor_links):
-        print(f"Scraping exhibitor {i+1}/{len(all_exhibitor_links)}")
-        data = scrape_exhibitor_detail(driver, link)
-        exhibitors_data.append(data)
-        
-        # Save progress every 50 records
-        if (i + 1) % 50 == 0:
-            df = pd.DataFrame(exhibitors_data)
-            df.to_csv('re25_exhibitors_progress.csv', index=False)
-            print(f"Progress saved at {i+1} records")
-        
-        time.sleep(0.5)  # Respectful delay
+    # Detail pages are scraped while the gallery is still being listed; results arrive as they complete
+    all_exhibitor_links = []
+    completed = 0
+    try:
+        async for data in scrape_details(iter_new_links(scraped_urls, all_exhibitor_links)):
+            writer_q.put(data)
+            completed += 1
+            print(f"Scraped exhibitor {len(scraped_urls) + completed}/{len(all_exhibitor_links)} found so far")
+        print(f"Final count: {len(all_exhibitor_links)} exhibitor links found")
+    finally:
+        # Flush queued rows and close browsers even on errors or Ctrl-C
+        writer_q.put(None)
+        writer_thread.join()
+        quit_thread_drivers()
     
     # Final save
-    df = pd.DataFrame(exhibitors_data)
-    df.to_csv('re25_exhibitors_complete.csv', index=False)
-    print(f"Scraping complete! Saved {len(exhibitors_data)} exhibitors to CSV")
-    
-    driver.quit()
+    df = pd.read_csv(PROGRESS_FILE, dtype=str, keep_default_na=False)
+    df = df.drop_duplicates('Detail Page URL', keep='last')  # A page re-scraped after a crash keeps its newest row
+    df.to_parquet('re25_exhibitors_complete.parquet', engine='pyarrow', compression='zstd', index=False)
+    print(f"Scraping complete! Saved {len(df)} exhibitors to Parquet")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main_async())
     
     
\ No newline at end of file
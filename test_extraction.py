@@ -0,0 +1,87 @@
+import lxml.html
+import pytest
+
+import boot
+import exibitor
+
+
+@pytest.fixture(params=[boot, exibitor], ids=['boot', 'exibitor'])
+def scraper(request):
+    return request.param
+
+
+def parse(scraper, body):
+    return scraper.parse_exhibitor_detail(f'<html><body>{body}</body></html>'.encode(), 'https://example.com/d')
+
+
+def test_extracts_every_field(scraper):
+    data = parse(scraper, '''
+        <h1> Acme Solar </h1>
+        <div class="booth-number">Booth 1234</div>
+        <a href="https://acme.example" target="_blank">Website</a>
+        <div class="contact-info">555-0100</div>
+        <p class="address">1 Main St</p>
+        <span class="email">info@acme.example</span>
+    ''')
+    assert data == {
+        'Exhibitor Name': 'Acme Solar',
+        'Website URL': 'https://acme.example',
+        'Booth Location': 'Booth 1234',
+        'Contact Info': '555-0100 | 1 Main St | info@acme.example',
+        'Detail Page URL': 'https://example.com/d'
+    }
+
+
+def test_missing_fields_are_na(scraper):
+    data = parse(scraper, '<p>Nothing here</p>')
+    assert data['Exhibitor Name'] == 'N/A'
+    assert data['Website URL'] == 'N/A'
+    assert data['Booth Location'] == 'N/A'
+    assert data['Contact Info'] == 'N/A'
+
+
+def test_name_prefers_h1_then_title_then_itemprop(scraper):
+    assert parse(scraper, '<span itemprop="name">Item</span><div class="exhibitor-title">Title</div><h1>H1</h1>')[
+        'Exhibitor Name'] == 'H1'
+    # An empty h1 falls through to the next selector, like the old select_one() loop
+    assert parse(scraper, '<h1> </h1><span itemprop="name">Item</span><div class="exhibitor-title">Title</div>')[
+        'Exhibitor Name'] == 'Title'
+    assert parse(scraper, '<span itemprop="name">Item</span>')['Exhibitor Name'] == 'Item'
+
+
+def test_class_selectors_match_whole_tokens(scraper):
+    # .exhibitor-title must not match a class that merely starts with it
+    assert parse(scraper, '<div class="exhibitor-title-wrap">Wrap</div>')['Exhibitor Name'] == 'N/A'
+    assert parse(scraper, '<div class="card  exhibitor-title\tlarge">Title</div>')['Exhibitor Name'] == 'Title'
+
+
+def test_booth_prefers_number_then_location_then_any_booth_class(scraper):
+    body = '<div class="mybooth-x">Any</div><div class="booth-location">Hall A</div><div class="booth-number">42</div>'
+    assert parse(scraper, body)['Booth Location'] == '42'
+    body = '<div class="mybooth-x">Any</div><div class="booth-location">Hall A</div>'
+    assert parse(scraper, body)['Booth Location'] == 'Hall A'
+    # [class*="booth"] is a substring match
+    assert parse(scraper, '<div class="mybooth-x">Any</div>')['Booth Location'] == 'Any'
+
+
+def test_website_fallback_order(scraper):
+    body = ('<a target="_blank" href="/blank">b</a><span itemprop="url" href="/item">i</span>'
+            '<a class="website-link" href="/link">l</a><a href="https://first.example">f</a>')
+    assert parse(scraper, body)['Website URL'] == 'https://first.example'
+    body = ('<a target="_blank" href="/blank">b</a><span itemprop="url" href="/item">i</span>'
+            '<a class="website-link" href="/link">l</a>')
+    assert parse(scraper, body)['Website URL'].endswith('/link')
+    body = '<a target="_blank" href="/blank">b</a><span itemprop="url" href="/item">i</span>'
+    assert parse(scraper, body)['Website URL'].endswith('/item')
+    assert parse(scraper, '<a target="_blank" href="/blank">b</a>')['Website URL'].endswith('/blank')
+
+
+def test_exibitor_resolves_relative_websites():
+    tree = lxml.html.fromstring('<html><body><a class="website-link" href="/site">l</a></body></html>')
+    assert exibitor.extract_website(tree) == 'https://re25.mapyourshow.com/site'
+
+
+def test_contact_blocks_in_document_order_skipping_empty(scraper):
+    body = ('<span class="email">e@x</span><div class="contact-details"> </div>'
+            '<p class="address">Addr</p><div class="main-contact">Phone</div><p class="addresses">no</p>')
+    assert parse(scraper, body)['Contact Info'] == 'e@x | Addr | Phone'
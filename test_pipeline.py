@@ -0,0 +1,290 @@
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import queue
+import threading
+import time
+
+import aiohttp
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiolimiter import AsyncLimiter
+
+import boot
+import exibitor
+
+
+@pytest.fixture(params=[boot, exibitor], ids=['boot', 'exibitor'])
+def scraper(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(request.param, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(request.param, 'RATE_LIMITER', AsyncLimiter(1000, 1))
+    return request.param
+
+
+@contextlib.asynccontextmanager
+async def serve(handler):
+    """Run handler on a local HTTP server and yield its base URL"""
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield f'http://{host}:{port}'
+    finally:
+        await runner.cleanup()
+
+
+async def detail_page(request):
+    return web.Response(text=f'<html><body><h1>Ex {request.path}</h1></body></html>', content_type='text/html')
+
+
+def test_cache_round_trip(scraper):
+    assert scraper.read_cached_page('https://example.com/a') is None
+    scraper.write_cached_page('https://example.com/a', b'<html>a</html>')
+    assert scraper.read_cached_page('https://example.com/a') == b'<html>a</html>'
+
+    # Entries older than CACHE_MAX_AGE are treated as missing
+    path = scraper.cache_path('https://example.com/a')
+    os.utime(path, (0, 0))
+    assert scraper.read_cached_page('https://example.com/a') is None
+
+
+def test_concurrent_cache_writes_for_one_url(scraper):
+    errors = []
+
+    def write_many():
+        for _ in range(100):
+            try:
+                scraper.write_cached_page('https://example.com/a', b'<html>' * 1000)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    # No temp files are left behind next to the cached page
+    assert os.listdir(scraper.CACHE_DIR) == [os.path.basename(scraper.cache_path('https://example.com/a'))]
+
+
+def test_fetch_uses_cache_and_survives_failed_cache_write(scraper, monkeypatch):
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        return await detail_page(request)
+
+    async def run():
+        async with serve(handler) as base, aiohttp.ClientSession() as session:
+            first = await scraper.fetch(session, f'{base}/a')
+            assert await scraper.fetch(session, f'{base}/a') == first
+            assert hits == ['/a']
+
+            def broken_write(url, body):
+                raise OSError('disk full')
+            monkeypatch.setattr(scraper, 'write_cached_page', broken_write)
+            assert b'Ex /b' in await scraper.fetch(session, f'{base}/b')
+
+    asyncio.run(run())
+
+
+def resume_set(scraper, filename):
+    if scraper is exibitor:
+        return exibitor.get_existing_data(filename)[0]
+    return boot.get_scraped_urls(filename)
+
+
+def test_resume_skips_saved_rows_but_retries_failed_fetches(scraper, tmp_path):
+    progress = tmp_path / 'progress.csv'
+    progress.write_text('Exhibitor Name,Website URL,Booth Location,Contact Info,Detail Page URL\n'
+                        'Acme,N/A,N/A,N/A,https://example.com/ok\n'
+                        'N/A,N/A,N/A,N/A,https://example.com/failed\n')
+    assert resume_set(scraper, str(progress)) == {'https://example.com/ok'}
+    assert resume_set(scraper, str(tmp_path / 'missing.csv')) == set()
+
+
+def test_resume_stops_on_unreadable_progress_file(scraper, tmp_path):
+    progress = tmp_path / 'progress.csv'
+    progress.write_text('a,b\n1,2\n')
+    with pytest.raises(Exception):
+        resume_set(scraper, str(progress))
+
+
+def test_failed_fetch_is_retried_on_the_next_run(scraper, monkeypatch):
+    requests_seen = []
+
+    async def handler(request):
+        requests_seen.append(request.path)
+        if request.path == '/flaky' and requests_seen.count('/flaky') == 1:
+            raise web.HTTPInternalServerError()
+        return await detail_page(request)
+
+    async def run():
+        async with serve(handler) as base:
+            async def one_page():
+                yield [f'{base}/a', f'{base}/flaky']
+            monkeypatch.setattr(scraper, 'iter_exhibitor_links', one_page)
+            await scraper.main_async()
+            await scraper.main_async()
+            return base
+
+    base = asyncio.run(run())
+    # The second run refetches only the page that failed, and the Parquet keeps its good row
+    assert sorted(requests_seen) == ['/a', '/flaky', '/flaky']
+    final = pd.read_parquet(getattr(scraper, 'FINAL_FILE', 're25_exhibitors_complete.parquet'))
+    assert sorted(final['Exhibitor Name']) == ['Ex /a', 'Ex /flaky']
+    assert sorted(final['Detail Page URL']) == [f'{base}/a', f'{base}/flaky']
+
+
+async def slow_detail_page(request):
+    await asyncio.sleep(0.2)
+    return await detail_page(request)
+
+
+async def aiter_list(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.parametrize('as_async', [False, True], ids=['list', 'async-iterable'])
+def test_scrape_details_yields_every_url(scraper, as_async):
+    async def run():
+        async with serve(detail_page) as base:
+            urls = [f'{base}/{i}' for i in range(30)]
+            results = [data async for data in scraper.scrape_details(aiter_list(urls) if as_async else urls)]
+            return urls, results
+
+    urls, results = asyncio.run(run())
+    assert sorted(data['Detail Page URL'] for data in results) == sorted(urls)
+    assert all(data['Exhibitor Name'] == f"Ex /{data['Detail Page URL'].rsplit('/', 1)[1]}" for data in results)
+
+
+def test_listing_error_keeps_in_flight_details(scraper, monkeypatch):
+    async def run():
+        async with serve(slow_detail_page) as base:
+            async def failing_listing():
+                yield [f'{base}/{i}' for i in range(20)]
+                raise RuntimeError('gallery page 2 failed')
+            monkeypatch.setattr(scraper, 'iter_exhibitor_links', failing_listing)
+            with pytest.raises(RuntimeError, match='gallery page 2 failed'):
+                await scraper.main_async()
+
+    asyncio.run(run())
+    # Details already being fetched when listing failed still reach the progress file
+    progress = pd.read_csv(scraper.PROGRESS_FILE, dtype=str, keep_default_na=False)
+    assert len(progress) == 20
+    assert 'N/A' not in set(progress['Exhibitor Name'])
+
+
+def test_stopping_early_cancels_workers(scraper):
+    async def run():
+        async with serve(slow_detail_page) as base:
+            results = scraper.scrape_details([f'{base}/{i}' for i in range(100)])
+            await results.__anext__()
+            await results.aclose()
+            return [task for task in asyncio.all_tasks() if task.get_coro().__name__ in ('produce_links', 'consume_details')]
+
+    assert asyncio.run(run()) == []
+
+
+def read_progress(filename):
+    if not os.path.exists(filename):
+        return []
+    with open(filename, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def row(name):
+    return {'Exhibitor Name': name, 'Website URL': 'N/A', 'Booth Location': 'N/A', 'Contact Info': 'N/A',
+            'Detail Page URL': f'https://example.com/{name}'}
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_writer_loop_flushes_by_rows_and_time(scraper, tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, 'PROGRESS_FLUSH_ROWS', 2)
+    monkeypatch.setattr(scraper, 'PROGRESS_FLUSH_SECONDS', 0.05)
+    progress = str(tmp_path / 'progress.csv')
+    writer_q = queue.Queue()
+    writer_thread = threading.Thread(target=scraper.writer_loop, args=(writer_q, progress), daemon=True)
+    writer_thread.start()
+    try:
+        # Two rows reach PROGRESS_FLUSH_ROWS; a lone third row is flushed once PROGRESS_FLUSH_SECONDS pass
+        writer_q.put(row('a'))
+        writer_q.put(row('b'))
+        wait_for(lambda: len(read_progress(progress)) == 2)
+        writer_q.put(row('c'))
+        wait_for(lambda: len(read_progress(progress)) == 3)
+    finally:
+        writer_q.put(None)
+        writer_thread.join(timeout=2)
+    assert not writer_thread.is_alive()
+
+
+def test_writer_loop_appends_without_repeating_the_header(scraper, tmp_path):
+    progress = str(tmp_path / 'progress.csv')
+    for name in ('a', 'b'):
+        writer_q = queue.Queue()
+        writer_q.put(row(name))
+        writer_q.put(None)
+        scraper.writer_loop(writer_q, progress)
+    assert [r['Exhibitor Name'] for r in read_progress(progress)] == ['a', 'b']
+
+
+def test_find_exhibitor_ids_walks_any_nesting(scraper):
+    payload = {'response': {'hits': [{'fields': {'exhid_l': '11', 'name': 'A'}}, {'exhid': ['12', '13']}],
+                            'meta': {'page': 1}},
+               'featured': [{'exhibitorId': 14}]}
+    assert list(scraper.find_exhibitor_ids(payload)) == ['11', '12', '13', 14]
+    assert list(scraper.find_exhibitor_ids({'page': 1, 'hits': []})) == []
+
+
+def test_list_api_pages_become_detail_links(scraper, monkeypatch):
+    async def handler(request):
+        page = int(request.query['page'])
+        # Duplicate IDs on a page collapse into one link
+        return web.json_response({'hits': [{'exhid': f'{page}1'}, {'exhid': f'{page}2'}, {'exhid': f'{page}1'}]})
+
+    async def run():
+        async with serve(handler) as base:
+            monkeypatch.setattr(scraper, 'LIST_API', f'{base}/list')
+            monkeypatch.setattr(scraper, 'DETAIL_URL', 'https://example.com/d?exhid={exhid}')
+            monkeypatch.setattr(scraper, 'TOTAL_PAGES', 2)
+            return [links async for links in scraper.iter_exhibitor_links()]
+
+    assert asyncio.run(run()) == [['https://example.com/d?exhid=11', 'https://example.com/d?exhid=12'],
+                                  ['https://example.com/d?exhid=21', 'https://example.com/d?exhid=22']]
+
+
+class FakeLoggingDriver:
+    def __init__(self, urls):
+        self.entries = [{'message': json.dumps({'message': {
+            'method': 'Network.responseReceived',
+            'params': {'type': kind, 'response': {'url': url, 'mimeType': 'application/json'}}}})}
+            for kind, url in urls]
+
+    def get_log(self, kind):
+        return self.entries
+
+
+def test_find_list_api_ignores_unrelated_json(scraper):
+    driver = FakeLoggingDriver([('XHR', 'https://www.google-analytics.com/collect'),
+                                ('Fetch', 'https://example.com/api/config.json'),
+                                ('Script', 'https://example.com/ajax/exhibitor-list.json'),
+                                ('XHR', 'https://example.com/ajax/remote-proxy.cfm/exhibitor-gallery?page=1')])
+    assert scraper.find_list_api(driver) == 'https://example.com/ajax/remote-proxy.cfm/exhibitor-gallery?page=1'
+    assert scraper.find_list_api(FakeLoggingDriver([('XHR', 'https://example.com/config')])) is None